@@ -0,0 +1,54 @@
+"""
+File: test_workout_planner_llm_based_tool
+Description:
+Tests for the medical-concern detection in workout_planner_llm_based_tool, which routes requests to the escalation model and keeps such notes out of semantic plan reuse.
+
+Run from the src directory with: python -m pytest
+"""
+
+
+import pytest
+
+pytest.importorskip("langchain_openai")
+
+from workout_planner_llm_based_tool import _allows_semantic_match, _mentions_medical_concern
+
+MEDICAL_NOTES = [
+    "I have back pains",
+    "Pain in my lower back",
+    "painful knees after running",
+    "recovering from a knee injury",
+    "torn ACL last year",
+    "sprained ankle",
+    "sciatica flares up when I sit",
+    "tendonitis in my elbow",
+    "tendinitis",
+    "had a knee replacement",
+    "recovering from a stroke",
+    "osteoarthritis in both hips",
+    "herniated disc",
+    "slipped disk",
+    "I'm pregnant",
+    "on blood pressure medication",
+]
+
+NON_MEDICAL_NOTES = [
+    "no pain, no gain",
+    "No pain no gain!",
+    "no pains, no gains",
+    "I want more conditioning work",
+    "I train with heart rate zones",
+    "painting is my other hobby",
+    "I swim breaststroke twice a week",
+    "focus on upper body strength",
+]
+
+@pytest.mark.parametrize("additional_info", MEDICAL_NOTES)
+def test_medical_notes_are_detected(additional_info):
+    assert _mentions_medical_concern(additional_info)
+    assert not _allows_semantic_match(additional_info)
+
+@pytest.mark.parametrize("additional_info", NON_MEDICAL_NOTES)
+def test_non_medical_notes_are_not_detected(additional_info):
+    assert not _mentions_medical_concern(additional_info)
+    assert _allows_semantic_match(additional_info)
\ No newline at end of file
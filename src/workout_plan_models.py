@@ -0,0 +1,74 @@
+"""
+File: workout_plan_models
+Description: 
+This file defines the structured response schema shared by the workout planner tools. It includes:
+
+1. An ExerciseSpec class describing a single exercise: its name, sets, reps, and optional rest period and form cues.
+
+2. A DaySpec class grouping the exercises for one workout day.
+
+3. A WorkoutPlan class holding the full plan: introduction, day-by-day breakdown, progression, warm-up, cool-down, and dietary advice.
+
+4. A DetailedWorkoutPlan class, a WorkoutPlan in which every section is required. It is the schema the LLM is bound to, so a plan missing a section is rejected instead of returned.
+
+Both WorkoutPlannerTool and LlmWorkoutPlannerTool return a WorkoutPlan serialized as JSON, so downstream agents can consume the plan directly without re-parsing free-form text. The LLM-based tool passes DetailedWorkoutPlan to the model as its output schema.
+
+Author: Juan Olano
+Date created: 10/15/2026
+Last modified: 10/15/2026
+
+This file is part of the Workout Planner Agent project.
+
+License: MIT License
+
+Copyright (c) {current_year} {your_name}
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from langchain.pydantic_v1 import BaseModel, Field
+from typing import List, Optional
+
+class ExerciseSpec(BaseModel):
+    name: str = Field(..., description="Name of the exercise")
+    sets: int = Field(..., description="Number of sets")
+    reps: str = Field(..., description="Reps or time per set (e.g., 10-15 reps, 30-60 seconds)")
+    rest: Optional[str] = Field(None, description="Rest period between sets (e.g., 60 seconds)")
+    form_cues: Optional[str] = Field(None, description="Form cues for performing the exercise correctly")
+
+class DaySpec(BaseModel):
+    day: int = Field(..., description="Day number within the week, starting at 1")
+    exercises: List[ExerciseSpec] = Field(..., description="Exercises for this day, in order")
+
+class WorkoutPlan(BaseModel):
+    """A personalized weekly workout plan."""
+    intro: str = Field(..., description="Brief introduction explaining the plan's focus and how it aligns with the user's goals")
+    days: List[DaySpec] = Field(..., description="Day-by-day breakdown of exercises")
+    duration: Optional[int] = Field(None, description="Target duration of each workout session in minutes")
+    progression: Optional[str] = Field(None, description="Progression suggestions for the coming weeks")
+    warmup: Optional[str] = Field(None, description="Warm-up routine")
+    cooldown: Optional[str] = Field(None, description="Cool-down routine")
+    diet: Optional[str] = Field(None, description="Dietary advice that complements the plan")
+
+class DetailedWorkoutPlan(WorkoutPlan):
+    """A personalized weekly workout plan with every section filled in."""
+    progression: str = Field(..., description="Progression suggestions for the coming weeks")
+    warmup: str = Field(..., description="Warm-up routine")
+    cooldown: str = Field(..., description="Cool-down routine")
+    diet: str = Field(..., description="Dietary advice that complements the plan")
\ No newline at end of file
@@ -5,15 +5,20 @@ This file defines an AI-powered structured tool for generating personalized work
 
 1. A LlmWorkoutPlannerInput class that specifies the required input parameters for creating a workout plan, including fitness level, goals, available equipment, and additional preferences.
 
-2. A create_llm_workout_plan function that generates a detailed, customized workout plan using OpenAI's GPT-4 model. This function:
-   - Initializes a ChatOpenAI instance with the GPT-4 model
-   - Uses a ChatPromptTemplate to create a detailed prompt for the LLM
-   - Generates a comprehensive workout plan based on user inputs
+2. A create_llm_workout_plan function, and its async counterpart acreate_llm_workout_plan, that generate a detailed, customized workout plan using OpenAI's GPT-4o models. These functions:
+   - Route each request to gpt-4o-mini, escalating to gpt-4o for advanced users, long additional information, or medical concerns
+   - Share one lazily created ChatOpenAI instance per model
+   - Uses a ChatPromptTemplate with a static system message followed by the user's details, so the shared prefix can be served from OpenAI's prompt cache
+   - Generates a comprehensive workout plan based on user inputs, returned as WorkoutPlan JSON. The DetailedWorkoutPlan schema, which requires every rubric section, is bound to the model as a required tool call, and plans cut off at the token limit are rejected rather than returned or cached
+   - Caches generated plans by input fields in a bounded LRU cache, reusing them for exact repeats and for requests whose additional information is semantically similar (compared with text-embedding-3-small); notes with medical concerns are only reused on an exact match
+   - Streams the plan JSON token by token through astream_llm_workout_plan, so the first tokens are available before generation finishes
    - Includes introduction, day-by-day breakdown, form cues, progression suggestions, warm-up/cool-down tips, and dietary advice
 
-3. Integration with OpenAI's API, including setup for API key management
+3. Integration with OpenAI's API, including API key management: the key is read from OPENAI_API_KEY, or from a key file, on first use rather than at import time
 
-4. A StructuredTool object (LlmWorkoutPlannerTool) that wraps the create_llm_workout_plan function, making it compatible with LangChain's tool system
+4. A StructuredTool object (LlmWorkoutPlannerTool) that wraps the create_llm_workout_plan and acreate_llm_workout_plan functions, making it compatible with LangChain's tool system
+
+5. Functions that generate plans for many users at once through the OpenAI Batch API, for offline jobs such as pre-generating plans for a cohort: submit_llm_workout_plans_batch and collect_llm_workout_plans_batch, wrapped as StructuredTools (LlmWorkoutPlannerBatchSubmitTool and LlmWorkoutPlannerBatchResultsTool), and create_llm_workout_plans_batch, which submits and waits for the results in one blocking call
 
 This tool leverages AI to create highly personalized and detailed workout plans, considering various factors such as fitness level, goals, equipment availability, and user preferences. It can be integrated into a larger AI agent system to provide sophisticated fitness recommendations.
 
@@ -48,33 +53,289 @@ SOFTWARE.
 
 
 from langchain.tools import StructuredTool
-from langchain.pydantic_v1 import BaseModel, Field
-from langchain_openai import ChatOpenAI
+from langchain.pydantic_v1 import BaseModel, Field, validator
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain.prompts import ChatPromptTemplate
-from typing import Optional, List
-import os
-
-# Ensure you have set your OpenAI API key in your environment variables
-# os.environ["OPENAI_API_KEY"] = "your-api-key-here"
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from typing import AsyncIterator, Dict, Literal, NamedTuple, Optional, List, Tuple, Union
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from tenacity import (
+    AsyncRetrying, Retrying, retry_if_exception, stop_after_attempt, wait_exponential
+)
+import asyncio
+import json
+import math
 import os
+import re
+import time
 import openai
 
-with open('../../../apikeys/api_openai_aimakerspace.key', 'r') as file:
-    api_key = file.read().strip()
+from workout_plan_models import DetailedWorkoutPlan
+
+# Fallback location of the OpenAI API key when OPENAI_API_KEY is not set
+API_KEY_PATH = '../../../apikeys/api_openai_aimakerspace.key'
+
+@lru_cache(maxsize=1)
+def _get_api_key() -> str:
+    # Read lazily on first use rather than at import time
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if api_key:
+        return api_key
 
-openai.api_key = api_key
-os.environ["OPENAI_API_KEY"] = openai.api_key
+    with open(API_KEY_PATH, 'r') as file:
+        return file.read().strip()
 
 class LlmWorkoutPlannerInput(BaseModel):
-    fitness_level: str = Field(..., description="The user's fitness level (beginner, intermediate, advanced)")
+    fitness_level: Literal["beginner", "intermediate", "advanced"] = Field(..., description="The user's fitness level (beginner, intermediate, advanced)")
     goal: str = Field(..., description="The user's fitness goal (e.g., weight loss, muscle gain, endurance)")
     days_per_week: int = Field(..., description="Number of workout days per week")
     duration: Optional[int] = Field(None, description="Desired workout duration in minutes (optional)")
-    equipment: str = Field(..., description="Available equipment (full gym, basic dumbbells, no equipment)")
+    equipment: Literal["full gym", "basic dumbbells", "no equipment"] = Field(..., description="Available equipment (full gym, basic dumbbells, no equipment)")
     body_weight_only: bool = Field(False, description="Whether to use only body weight exercises")
     additional_info: Optional[str] = Field(None, description="Any additional information or preferences")
 
-def create_llm_workout_plan(
+    @validator("days_per_week")
+    def check_days_per_week(cls, v):
+        if not 1 <= v <= 7:
+            raise ValueError("days_per_week must be between 1 and 7")
+        return v
+
+# Static instructions go first so every request shares the same prompt prefix,
+# which lets OpenAI's automatic prompt caching reuse it across users.
+STATIC_RUBRIC = """Expert personal trainer. Write a workout plan for the user's details, challenging for their level and using their equipment.
+Return a DetailedWorkoutPlan: intro (focus, fit to goal); days with exercises (sets, reps, rest, form cues for key exercises); 4-week progression; warm-up; cool-down; diet tips.
+Body weight only => calisthenics/bodyweight exercises only."""
+
+# User-specific fields are kept at the tail of the prompt
+USER_VARS = "level={fitness_level}; goal={goal}; days/wk={days_per_week}; equip={equipment}; bw_only={body_weight_only}; dur={duration} min; notes={additional_info}"
+
+# Compiled once and shared by every request
+PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
+    ("system", STATIC_RUBRIC),
+    ("user", USER_VARS)
+])
+
+# OpenAI tool definition of the plan schema; the model is required to call it
+WORKOUT_PLAN_TOOL = convert_to_openai_tool(DetailedWorkoutPlan)
+WORKOUT_PLAN_TOOL_NAME = WORKOUT_PLAN_TOOL["function"]["name"]
+
+# Routes requests to the same backend so they share the cached prefix
+PROMPT_CACHE_KEY = "workout_planner_v4"
+
+# Sampling temperature for plan generation
+TEMPERATURE = 0.7
+
+# Output token budget for every plan. A detailed 7-day plan in JSON runs to roughly 3,000 tokens,
+# and a truncated plan cannot be parsed at all, so the cap leaves headroom rather than tracking length.
+MAX_TOKENS = 4096
+
+# Upper bound on concurrent plan generations in flight
+MAX_CONCURRENT_REQUESTS = 32
+
+# Default model, and the model used for requests that need more care
+DEFAULT_MODEL = "gpt-4o-mini"
+ESCALATION_MODEL = "gpt-4o"
+
+# Additional information longer than this is routed to the escalation model
+ESCALATION_INFO_LENGTH = 400
+
+# Terms in the additional information that suggest medical considerations. Matched on word
+# boundaries so that e.g. "conditioning", "heart rate zones" and "no pain, no gain" don't escalate.
+MEDICAL_PATTERN = re.compile(
+    r"\b("
+    r"injur\w*|pain(?!t)\w*(?!\W+no\W+gains?\b)|surger\w*|pregnan\w*|postpartum|"
+    r"torn|sprain\w*|strained|fractur\w*|dislocat\w*|acl|mcl|meniscus|rotator cuff|"
+    r"tendon\w*|tendin\w*|bursitis|fasciitis|sciatica|scoliosis|(?:slipped|bulging) dis[ck]s?|"
+    r"(?:knee|hip|shoulder|joint) replacement|concussion\w*|stroke|"
+    r"heart (?:condition|disease|problem|problems|attack|surgery)|cardiac|"
+    r"blood pressure|hypertension|diabet\w*|asthma\w*|\w*arthriti\w*|osteoporosis|"
+    r"hernia\w*|epilep\w*|seizures?|cancer|chemo\w*|copd|"
+    r"doctor|physician|physio\w*|medical condition|medication\w*|rehab\w*"
+    r")\b",
+    re.IGNORECASE
+)
+
+def _normalize_additional_info(additional_info: Optional[str]) -> Optional[str]:
+    # Surrounding whitespace is dropped and blank notes count as missing, so every path routes,
+    # prompts and caches the same note the same way
+    return (additional_info.strip() or None) if additional_info else None
+
+def _mentions_medical_concern(additional_info: Optional[str]) -> bool:
+    if not additional_info:
+        return False
+
+    return MEDICAL_PATTERN.search(additional_info) is not None
+
+def _choose_model(additional_info: Optional[str], fitness_level: str) -> str:
+    if fitness_level == "advanced":
+        return ESCALATION_MODEL
+
+    if additional_info:
+        if len(additional_info) > ESCALATION_INFO_LENGTH or _mentions_medical_concern(additional_info):
+            return ESCALATION_MODEL
+
+    return DEFAULT_MODEL
+
+# Transient OpenAI errors that are retried with exponential backoff
+RETRYABLE_ERRORS = (
+    openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError
+)
+
+# Attempts per LLM call, and the timeout in seconds for each attempt
+MAX_ATTEMPTS = 5
+REQUEST_TIMEOUT = 30
+
+def _is_retryable(error: BaseException) -> bool:
+    # An exhausted quota is also reported as a 429 but will not recover by retrying
+    if isinstance(error, openai.RateLimitError) and getattr(error, "code", None) == "insufficient_quota":
+        return False
+    return isinstance(error, RETRYABLE_ERRORS)
+
+_RETRY_SETTINGS = dict(
+    wait=wait_exponential(multiplier=1, min=1, max=16),
+    stop=stop_after_attempt(MAX_ATTEMPTS),
+    reraise=True
+)
+
+@lru_cache(maxsize=2)
+def _get_llm(model_name: str) -> Runnable:
+    # Each LLM is created once so its HTTP connection pool is reused across calls.
+    # It is bound to the DetailedWorkoutPlan schema so every response is a structured plan.
+    llm = ChatOpenAI(
+        model_name=model_name,
+        temperature=TEMPERATURE,
+        streaming=True,
+        max_tokens=MAX_TOKENS,
+        request_timeout=REQUEST_TIMEOUT,
+        # Retries are handled with backoff around each call instead
+        max_retries=0,
+        api_key=_get_api_key(),
+        model_kwargs={"prompt_cache_key": PROMPT_CACHE_KEY}
+    )
+    return llm.bind_tools([DetailedWorkoutPlan], tool_choice=WORKOUT_PLAN_TOOL_NAME)
+
+def _workout_plan_json(arguments: str) -> str:
+    # Validate the model's plan against the schema and serialize it compactly
+    return DetailedWorkoutPlan.parse_raw(arguments).json(exclude_none=True)
+
+def _check_finish_reason(finish_reason: Optional[str]):
+    # A plan cut off at the token limit may still parse after partial-JSON repair, so it is
+    # rejected outright rather than returned or cached
+    if finish_reason == "length":
+        raise RuntimeError(f"Workout plan generation was cut off at the {MAX_TOKENS}-token limit")
+
+_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# Plans whose additional information is at least this similar to a cached request are reused
+SIMILARITY_THRESHOLD = 0.92
+
+@lru_cache(maxsize=1)
+def _get_embeddings() -> OpenAIEmbeddings:
+    return OpenAIEmbeddings(model="text-embedding-3-small", api_key=_get_api_key())
+
+# Limits on the plan cache: distinct input combinations kept (least recently used are
+# evicted first), and plans kept per combination (oldest are evicted first)
+PLAN_CACHE_MAX_KEYS = 128
+PLAN_CACHE_MAX_PLANS_PER_KEY = 8
+
+# Generated plans, grouped by the discrete input fields.
+# Each entry is (additional_info, normalized additional_info embedding, plan).
+# Embeddings are stored as float32 arrays to keep the cache compact.
+_plan_cache: "OrderedDict[tuple, List[Tuple[Optional[str], Optional[array], str]]]" = OrderedDict()
+
+def _plan_cache_key(
+    fitness_level: str,
+    goal: str,
+    days_per_week: int,
+    equipment: str,
+    body_weight_only: bool,
+    duration: Optional[int] = None
+) -> tuple:
+    return (fitness_level.strip().lower(), goal.strip().lower(), days_per_week,
+            equipment.strip().lower(), body_weight_only, duration)
+
+def _normalize(embedding: List[float]) -> array:
+    norm = math.sqrt(sum(x * x for x in embedding))
+    return array("f", (x / norm for x in embedding) if norm else embedding)
+
+def _cosine_similarity(a: array, b: array) -> float:
+    # Both vectors are normalized, so the dot product is the cosine similarity
+    return sum(x * y for x, y in zip(a, b))
+
+def _allows_semantic_match(additional_info: Optional[str]) -> bool:
+    # Notes with medical concerns are only reused on an exact match: paraphrase-level similarity
+    # cannot tell "knee pain" from "no knee pain", or a left from a right shoulder injury.
+    # Such notes are stored without an embedding, so they are never matched semantically either.
+    return bool(additional_info) and not _mentions_medical_concern(additional_info)
+
+def _embed_additional_info(additional_info: Optional[str]) -> Optional[List[float]]:
+    # The embedding only enables cache reuse, so if it fails the request is treated as a cache miss
+    if not _allows_semantic_match(additional_info):
+        return None
+    try:
+        return _get_embeddings().embed_query(additional_info)
+    except openai.OpenAIError:
+        return None
+
+async def _aembed_additional_info(additional_info: Optional[str]) -> Optional[List[float]]:
+    if not _allows_semantic_match(additional_info):
+        return None
+    try:
+        return await _get_embeddings().aembed_query(additional_info)
+    except openai.OpenAIError:
+        return None
+
+def _find_cached_plan(
+    key: tuple,
+    additional_info: Optional[str],
+    embedding: Optional[List[float]] = None
+) -> Optional[str]:
+    entries = _plan_cache.get(key)
+    if not entries:
+        return None
+
+    # Exact match on the additional information
+    for cached_info, _, plan in entries:
+        if cached_info == additional_info:
+            _plan_cache.move_to_end(key)
+            return plan
+
+    # Semantic match for paraphrased additional information
+    if embedding is not None:
+        embedding = _normalize(embedding)
+        for _, cached_embedding, plan in entries:
+            if cached_embedding is not None and _cosine_similarity(embedding, cached_embedding) > SIMILARITY_THRESHOLD:
+                _plan_cache.move_to_end(key)
+                return plan
+
+    return None
+
+def _store_plan(
+    key: tuple,
+    additional_info: Optional[str],
+    embedding: Optional[List[float]],
+    plan: str
+):
+    entries = _plan_cache.setdefault(key, [])
+    _plan_cache.move_to_end(key)
+
+    if any(cached_info == additional_info for cached_info, _, _ in entries):
+        return
+
+    entries.append((additional_info, _normalize(embedding) if embedding is not None else None, plan))
+    if len(entries) > PLAN_CACHE_MAX_PLANS_PER_KEY:
+        del entries[0]
+
+    while len(_plan_cache) > PLAN_CACHE_MAX_KEYS:
+        _plan_cache.popitem(last=False)
+
+# Formatted prompts are memoized, so repeated inputs skip template rendering
+@lru_cache(maxsize=1024)
+def _format_llm_workout_prompt(
     fitness_level: str,
     goal: str,
     days_per_week: int,
@@ -82,36 +343,9 @@ def create_llm_workout_plan(
     body_weight_only: bool,
     duration: Optional[int] = None,
     additional_info: Optional[str] = None
-) -> str:
-    # Initialize the LLM
-    llm = ChatOpenAI(model_name="gpt-4", temperature=0.7)
-
-    # Create a prompt template
-    prompt = ChatPromptTemplate.from_template("""
-    You are an expert personal trainer. Create a detailed workout plan based on the following information:
-
-    Fitness Level: {fitness_level}
-    Goal: {goal}
-    Days per Week: {days_per_week}
-    Equipment: {equipment}
-    Body Weight Only: {body_weight_only}
-    Duration per Session: {duration} minutes
-    Additional Information: {additional_info}
-
-    Please create a workout plan that includes:
-    1. A brief introduction explaining the plan's focus and how it aligns with the user's goals.
-    2. A day-by-day breakdown of exercises, including sets, reps, and rest periods.
-    3. Proper form cues for key exercises.
-    4. Progression suggestions for the coming weeks.
-    5. Tips for warm-up and cool-down routines.
-    6. Any dietary advice that complements the workout plan.
-
-    Ensure the plan is appropriately challenging for the specified fitness level and uses available equipment effectively.
-    If body weight only is specified, focus exclusively on calisthenics and bodyweight exercises.
-    """)
-
-    # Format the prompt with user inputs
-    formatted_prompt = prompt.format(
+) -> Tuple[BaseMessage, ...]:
+    # Format the prompt with user inputs; a tuple keeps the cached value immutable
+    return tuple(PROMPT_TEMPLATE.format_messages(
         fitness_level=fitness_level,
         goal=goal,
         days_per_week=days_per_week,
@@ -119,16 +353,288 @@ def create_llm_workout_plan(
         body_weight_only=body_weight_only,
         duration=duration or "unspecified",
         additional_info=additional_info or "None provided"
+    ))
+
+class _PlanRequest(NamedTuple):
+    # Everything needed to generate a plan, or to cache it once generated
+    key: tuple
+    additional_info: Optional[str]
+    messages: Tuple[BaseMessage, ...]
+    llm: Runnable
+
+def _prepare_plan_request(
+    fitness_level: str,
+    goal: str,
+    days_per_week: int,
+    equipment: str,
+    body_weight_only: bool,
+    duration: Optional[int] = None,
+    additional_info: Optional[str] = None
+) -> Union[str, _PlanRequest]:
+    # Returns the cached plan for an identical request, or the request to send to the LLM.
+    # Semantic matching is left to the caller, since it needs a sync or async embedding call.
+    additional_info = _normalize_additional_info(additional_info)
+    key = _plan_cache_key(fitness_level, goal, days_per_week, equipment, body_weight_only, duration)
+
+    plan = _find_cached_plan(key, additional_info)
+    if plan is not None:
+        return plan
+
+    return _PlanRequest(
+        key=key,
+        additional_info=additional_info,
+        messages=_format_llm_workout_prompt(
+            fitness_level, goal, days_per_week, equipment, body_weight_only, duration, additional_info
+        ),
+        llm=_get_llm(_choose_model(additional_info, fitness_level))
+    )
+
+def create_llm_workout_plan(
+    fitness_level: str,
+    goal: str,
+    days_per_week: int,
+    equipment: str,
+    body_weight_only: bool,
+    duration: Optional[int] = None,
+    additional_info: Optional[str] = None
+) -> str:
+    request = _prepare_plan_request(
+        fitness_level, goal, days_per_week, equipment, body_weight_only, duration, additional_info
+    )
+    if isinstance(request, str):
+        return request
+
+    # Reuse a cached plan for requests with similar additional information
+    embedding = _embed_additional_info(request.additional_info)
+    plan = _find_cached_plan(request.key, request.additional_info, embedding)
+    if plan is not None:
+        return plan
+
+    # Generate the workout plan using the LLM, retrying transient API errors
+    for attempt in Retrying(retry=retry_if_exception(_is_retryable), **_RETRY_SETTINGS):
+        with attempt:
+            response = request.llm.invoke(request.messages)
+
+    _check_finish_reason(response.response_metadata.get("finish_reason"))
+    if not response.tool_calls:
+        raise RuntimeError("The model did not return a workout plan")
+
+    plan = _workout_plan_json(json.dumps(response.tool_calls[0]["args"]))
+    _store_plan(request.key, request.additional_info, embedding, plan)
+
+    return plan
+
+async def astream_llm_workout_plan(
+    fitness_level: str,
+    goal: str,
+    days_per_week: int,
+    equipment: str,
+    body_weight_only: bool,
+    duration: Optional[int] = None,
+    additional_info: Optional[str] = None
+) -> AsyncIterator[str]:
+    request = _prepare_plan_request(
+        fitness_level, goal, days_per_week, equipment, body_weight_only, duration, additional_info
+    )
+    if isinstance(request, str):
+        yield request
+        return
+
+    # Reuse a cached plan for requests with similar additional information.
+    # The embedding call counts against the same concurrency limit as plan generation.
+    async with _semaphore:
+        embedding = await _aembed_additional_info(request.additional_info)
+    plan = _find_cached_plan(request.key, request.additional_info, embedding)
+    if plan is not None:
+        yield plan
+        return
+
+    # Yield the workout plan JSON token by token as the LLM generates it
+    chunks = []
+    finish_reason = None
+    # Transient API errors are retried only until the first token has been yielded
+    retry_before_output = retry_if_exception(lambda e: _is_retryable(e) and not chunks)
+
+    # The concurrency slot is held per attempt, so it is released while backing off
+    async for attempt in AsyncRetrying(retry=retry_before_output, **_RETRY_SETTINGS):
+        with attempt:
+            async with _semaphore:
+                async for chunk in request.llm.astream(request.messages):
+                    finish_reason = chunk.response_metadata.get("finish_reason") or finish_reason
+                    arguments = "".join(tool_call["args"] or "" for tool_call in chunk.tool_call_chunks)
+                    if arguments:
+                        chunks.append(arguments)
+                        yield arguments
+
+    _check_finish_reason(finish_reason)
+    _store_plan(request.key, request.additional_info, embedding, _workout_plan_json("".join(chunks)))
+
+async def acreate_llm_workout_plan(
+    fitness_level: str,
+    goal: str,
+    days_per_week: int,
+    equipment: str,
+    body_weight_only: bool,
+    duration: Optional[int] = None,
+    additional_info: Optional[str] = None
+) -> str:
+    # Collect the streamed tokens for callers that need the full plan
+    chunks = []
+    async for chunk in astream_llm_workout_plan(
+        fitness_level, goal, days_per_week, equipment, body_weight_only, duration, additional_info
+    ):
+        chunks.append(chunk)
+
+    return _workout_plan_json("".join(chunks))
+
+# Seconds between status checks while a batch job is running
+BATCH_POLL_INTERVAL = 60
+
+# Batch statuses after which the job will not progress any further
+BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# Maps LangChain message types to OpenAI chat roles
+_MESSAGE_ROLES = {"system": "system", "human": "user"}
+
+class LlmWorkoutPlannerBatchInput(BaseModel):
+    inputs: List[LlmWorkoutPlannerInput] = Field(..., description="Workout plan requests, one per user")
+
+class LlmWorkoutPlannerBatchResultsInput(BaseModel):
+    batch_ids: List[str] = Field(..., description="Batch ids returned by LlmWorkoutPlannerBatchSubmit")
+
+@lru_cache(maxsize=1)
+def _get_openai_client() -> openai.OpenAI:
+    return openai.OpenAI(api_key=_get_api_key())
+
+def _batch_request(custom_id: str, model_name: str, plan_input: LlmWorkoutPlannerInput) -> dict:
+    messages = _format_llm_workout_prompt(
+        plan_input.fitness_level, plan_input.goal, plan_input.days_per_week, plan_input.equipment,
+        plan_input.body_weight_only, plan_input.duration, plan_input.additional_info
     )
 
-    # Generate the workout plan using the LLM
-    response = llm.invoke(formatted_prompt)
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": model_name,
+            "messages": [{"role": _MESSAGE_ROLES[message.type], "content": message.content} for message in messages],
+            "temperature": TEMPERATURE,
+            "max_tokens": MAX_TOKENS,
+            "tools": [WORKOUT_PLAN_TOOL],
+            "tool_choice": {"type": "function", "function": {"name": WORKOUT_PLAN_TOOL_NAME}},
+            "prompt_cache_key": PROMPT_CACHE_KEY
+        }
+    }
+
+def submit_llm_workout_plans_batch(inputs: List[LlmWorkoutPlannerInput]) -> List[str]:
+    inputs = [LlmWorkoutPlannerInput.parse_obj(i) if isinstance(i, dict) else i for i in inputs]
+    client = _get_openai_client()
 
-    return response.content
+    # The Batch API accepts a single model per input file, so requests are grouped by model.
+    # Each request's custom_id is its position in the inputs, which is unique across batches.
+    requests_by_model: Dict[str, List[dict]] = {}
+    for i, plan_input in enumerate(inputs):
+        plan_input = plan_input.copy(update={"additional_info": _normalize_additional_info(plan_input.additional_info)})
+        model_name = _choose_model(plan_input.additional_info, plan_input.fitness_level)
+        requests_by_model.setdefault(model_name, []).append(_batch_request(str(i), model_name, plan_input))
+
+    # Submit one batch job per model; the total request count lets results be collected in input order
+    batch_ids = []
+    for model_name, requests in requests_by_model.items():
+        requests_jsonl = "\n".join(json.dumps(request) for request in requests)
+        batch_file = client.files.create(
+            file=(f"workout_plans_{model_name}.jsonl", requests_jsonl.encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata={"workout_plan_count": str(len(inputs))}
+        )
+        batch_ids.append(batch.id)
+
+    return batch_ids
+
+def _parse_batch_result(result: dict) -> Optional[str]:
+    # Returns the plan JSON for one output row, or None if that request failed
+    if result.get("error"):
+        return None
+
+    response = result.get("response")
+    if not response or response.get("status_code") != 200:
+        return None
+
+    try:
+        choice = response["body"]["choices"][0]
+        if choice.get("finish_reason") == "length":
+            return None
+        tool_call = choice["message"]["tool_calls"][0]
+        return _workout_plan_json(tool_call["function"]["arguments"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+def _collect_batch_plans(batches: list) -> List[Optional[str]]:
+    if not batches:
+        return []
+
+    client = _get_openai_client()
+
+    # Map the results of all batches back to the order of the inputs. Failed requests stay None,
+    # as do the unfinished requests of a batch that failed, expired or was cancelled; an expired
+    # or cancelled batch still returns the requests it completed in its output file.
+    plans: List[Optional[str]] = [None] * int(batches[0].metadata["workout_plan_count"])
+    for batch in batches:
+        if not batch.output_file_id:
+            continue
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            result = json.loads(line)
+            plan = _parse_batch_result(result)
+            if plan is not None:
+                plans[int(result["custom_id"])] = plan
+
+    return plans
+
+def collect_llm_workout_plans_batch(batch_ids: List[str]) -> Union[str, List[Optional[str]]]:
+    client = _get_openai_client()
+    batches = [client.batches.retrieve(batch_id) for batch_id in batch_ids]
+
+    pending = [batch.id for batch in batches if batch.status not in BATCH_FINAL_STATUSES]
+    if pending:
+        return f"Workout plan batches are still running: {', '.join(pending)}. Check again later."
+
+    return _collect_batch_plans(batches)
+
+def create_llm_workout_plans_batch(inputs: List[LlmWorkoutPlannerInput]) -> List[Optional[str]]:
+    # Blocking helper for offline scripts; agents should use the submit and results tools instead
+    batch_ids = submit_llm_workout_plans_batch(inputs)
+    client = _get_openai_client()
+
+    while True:
+        batches = [client.batches.retrieve(batch_id) for batch_id in batch_ids]
+        if all(batch.status in BATCH_FINAL_STATUSES for batch in batches):
+            return _collect_batch_plans(batches)
+        time.sleep(BATCH_POLL_INTERVAL)
 
 LlmWorkoutPlannerTool = StructuredTool.from_function(
     func=create_llm_workout_plan,
+    coroutine=acreate_llm_workout_plan,
     name="LlmWorkoutPlanner",
-    description="Creates a personalized workout plan using AI, based on fitness level, goals, schedule, available equipment, and preferences.",
+    description="Creates a personalized workout plan using AI, based on fitness level, goals, schedule, available equipment, and preferences. Returns the plan as JSON.",
     args_schema=LlmWorkoutPlannerInput
+)
+
+LlmWorkoutPlannerBatchSubmitTool = StructuredTool.from_function(
+    func=submit_llm_workout_plans_batch,
+    name="LlmWorkoutPlannerBatchSubmit",
+    description="Submits personalized AI workout plan requests for many users at once to the OpenAI Batch API and returns the batch ids. Results can take up to 24 hours, so use it only for offline jobs and fetch them later with LlmWorkoutPlannerBatchResults.",
+    args_schema=LlmWorkoutPlannerBatchInput
+)
+
+LlmWorkoutPlannerBatchResultsTool = StructuredTool.from_function(
+    func=collect_llm_workout_plans_batch,
+    name="LlmWorkoutPlannerBatchResults",
+    description="Fetches the results of workout plan batches submitted with LlmWorkoutPlannerBatchSubmit, returning one JSON plan per user in input order (null for users whose plan could not be generated), or a message if the batches are still running.",
+    args_schema=LlmWorkoutPlannerBatchResultsInput
 )
\ No newline at end of file
@@ -5,19 +5,21 @@ This file defines a structured tool for generating personalized workout plans. I
 
 1. A WorkoutPlannerInput class that specifies the required input parameters for creating a workout plan, such as fitness level, goals, and available equipment.
 
-2. A create_workout_plan function that generates a customized workout plan based on the input parameters. This function:
+2. A create_workout_plan function that generates a customized workout plan based on the input parameters and returns it as WorkoutPlan JSON. This function:
    - Handles different fitness levels (beginner, intermediate, advanced)
    - Accommodates various equipment scenarios (full gym, basic dumbbells, no equipment)
    - Supports body weight only workouts
    - Creates progressive plans where higher fitness levels incorporate exercises from lower levels
-   - Randomly selects exercises for each workout day to provide variety
+   - Randomly selects exercises for each workout day to provide variety, optionally from a seeded generator for reproducible plans
    - Adjusts rep ranges based on the user's fitness goals
 
-3. A predefined set of exercises for different fitness levels and equipment types
+3. A predefined set of exercises for different fitness levels and equipment types, with the exercise pool for every combination built once at import time
 
-4. Logic to validate input parameters and handle potential errors
+4. A create_workout_plans function that generates plans for many users at once, reproducibly when given a seed
 
-5. A StructuredTool object (WorkoutPlannerTool) that wraps the create_workout_plan function, making it compatible with LangChain's tool system
+5. Logic to validate input parameters, reporting invalid input as a JSON object with an "error" message so every result is JSON
+
+6. A StructuredTool object (WorkoutPlannerTool) that wraps the create_workout_plan function, making it compatible with LangChain's tool system
 
 This tool can be integrated into a larger AI agent system to provide tailored workout recommendations based on user inputs.
 
@@ -51,93 +53,132 @@ SOFTWARE.
 """
 
 from langchain.tools import StructuredTool
-from langchain.pydantic_v1 import BaseModel, Field
-from typing import Optional, List
+from langchain.pydantic_v1 import BaseModel, Field, validator
+from typing import Literal, Optional, List
+import json
 import random
+import sys
+
+from workout_plan_models import DaySpec, ExerciseSpec, WorkoutPlan
 
 class WorkoutPlannerInput(BaseModel):
-    fitness_level: str = Field(..., description="The user's fitness level (beginner, intermediate, advanced)")
+    fitness_level: Literal["beginner", "intermediate", "advanced"] = Field(..., description="The user's fitness level (beginner, intermediate, advanced)")
     goal: str = Field(..., description="The user's fitness goal (e.g., weight loss, muscle gain, endurance)")
     days_per_week: int = Field(..., description="Number of workout days per week")
     duration: Optional[int] = Field(None, description="Desired workout duration in minutes (optional)")
-    equipment: str = Field(..., description="Available equipment (full gym, basic dumbbells, no equipment)")
+    equipment: Literal["full gym", "basic dumbbells", "no equipment"] = Field(..., description="Available equipment (full gym, basic dumbbells, no equipment)")
     body_weight_only: bool = Field(False, description="Whether to use only body weight exercises")
 
+    @validator("days_per_week")
+    def check_days_per_week(cls, v):
+        if not 1 <= v <= 7:
+            raise ValueError("days_per_week must be between 1 and 7")
+        return v
+
+_EXERCISES = {
+    "beginner": {
+        "full gym": ["Leg press", "Chest press machine", "Treadmill", "Seated cable rows", "Machine shoulder press"],
+        "basic dumbbells": ["Dumbbell squats", "Dumbbell bench press", "Dumbbell rows", "Dumbbell lunges", "Dumbbell curls"],
+        "no equipment": ["Bodyweight squats", "Push-ups", "Walking lunges", "Plank", "Mountain climbers"]
+    },
+    "intermediate": {
+        "full gym": ["Barbell squats", "Bench press", "Lat pulldowns", "Romanian deadlifts", "Cable face pulls"],
+        "basic dumbbells": ["Dumbbell lunges", "Dumbbell overhead press", "Dumbbell deadlifts", "Dumbbell flyes", "Dumbbell renegade rows"],
+        "no equipment": ["Jump squats", "Diamond push-ups", "Burpees", "Superman holds", "Mountain climbers"]
+    },
+    "advanced": {
+        "full gym": ["Deadlifts", "Weighted pull-ups", "Barbell rows", "Front squats", "Overhead press"],
+        "basic dumbbells": ["Dumbbell clean and press", "Renegade rows", "Bulgarian split squats", "Single-leg Romanian deadlifts", "Dumbbell thrusters"],
+        "no equipment": ["Pistol squats", "One-arm push-ups", "Muscle-ups", "Plyometric lunges", "L-sit holds"]
+    }
+}
+
+_BODY_WEIGHT_EXERCISES = {
+    "beginner": ["Bodyweight squats", "Push-ups", "Lunges", "Plank", "Mountain climbers", "Bird dogs", "Glute bridges"],
+    "intermediate": ["Jump squats", "Diamond push-ups", "Burpees", "Spider-man push-ups", "V-ups", "Box jumps", "Flutter kicks"],
+    "advanced": ["Pistol squats", "One-arm push-ups", "Plyometric lunges", "Handstand push-ups", "L-sit holds", "Muscle-ups", "Planche progressions"]
+}
+
+_FITNESS_LEVELS = ["beginner", "intermediate", "advanced"]
+_EQUIPMENT_OPTIONS = ["full gym", "basic dumbbells", "no equipment"]
+
+# Exercise pools for every (fitness_level, equipment, body_weight_only) combination,
+# built once at import. Higher levels include the exercises from the levels below.
+# Pools are immutable tuples of interned names, so every plan shares the same objects.
+_POOLS = {}
+for _i, _level in enumerate(_FITNESS_LEVELS):
+    _levels = _FITNESS_LEVELS[:_i + 1]
+    _body_weight_pool = tuple(sys.intern(exercise) for lvl in _levels for exercise in _BODY_WEIGHT_EXERCISES[lvl])
+    for _equipment in _EQUIPMENT_OPTIONS:
+        _POOLS[(_level, _equipment, False)] = tuple(
+            sys.intern(exercise) for lvl in _levels for exercise in _EXERCISES[lvl][_equipment]
+        )
+        _POOLS[(_level, _equipment, True)] = _body_weight_pool
+
+# Dedicated random generator for exercise selection
+_RNG = random.Random()
+
+def _invalid_input(message: str) -> str:
+    # Invalid input is reported as JSON too, so callers can always parse the result
+    return json.dumps({"error": message})
+
 def create_workout_plan(
     fitness_level: str,
     goal: str,
     days_per_week: int,
     equipment: str,
     body_weight_only: bool,
-    duration: Optional[int] = None
+    duration: Optional[int] = None,
+    seed: Optional[int] = None
 ) -> str:
-    exercises = {
-        "beginner": {
-            "full gym": ["Leg press", "Chest press machine", "Treadmill", "Seated cable rows", "Machine shoulder press"],
-            "basic dumbbells": ["Dumbbell squats", "Dumbbell bench press", "Dumbbell rows", "Dumbbell lunges", "Dumbbell curls"],
-            "no equipment": ["Bodyweight squats", "Push-ups", "Walking lunges", "Plank", "Mountain climbers"]
-        },
-        "intermediate": {
-            "full gym": ["Barbell squats", "Bench press", "Lat pulldowns", "Romanian deadlifts", "Cable face pulls"],
-            "basic dumbbells": ["Dumbbell lunges", "Dumbbell overhead press", "Dumbbell deadlifts", "Dumbbell flyes", "Dumbbell renegade rows"],
-            "no equipment": ["Jump squats", "Diamond push-ups", "Burpees", "Superman holds", "Mountain climbers"]
-        },
-        "advanced": {
-            "full gym": ["Deadlifts", "Weighted pull-ups", "Barbell rows", "Front squats", "Overhead press"],
-            "basic dumbbells": ["Dumbbell clean and press", "Renegade rows", "Bulgarian split squats", "Single-leg Romanian deadlifts", "Dumbbell thrusters"],
-            "no equipment": ["Pistol squats", "One-arm push-ups", "Muscle-ups", "Plyometric lunges", "L-sit holds"]
-        }
-    }
-
-    body_weight_exercises = {
-        "beginner": ["Bodyweight squats", "Push-ups", "Lunges", "Plank", "Mountain climbers", "Bird dogs", "Glute bridges"],
-        "intermediate": ["Jump squats", "Diamond push-ups", "Burpees", "Spider-man push-ups", "V-ups", "Box jumps", "Flutter kicks"],
-        "advanced": ["Pistol squats", "One-arm push-ups", "Plyometric lunges", "Handstand push-ups", "L-sit holds", "Muscle-ups", "Planche progressions"]
-    }
+    # A seed gives a reproducible plan, e.g. for tests and benchmarks
+    rng = random.Random(seed) if seed is not None else _RNG
 
-    if fitness_level not in exercises:
-        return "Invalid fitness level. Please choose beginner, intermediate, or advanced."
+    if fitness_level not in _FITNESS_LEVELS:
+        return _invalid_input("Invalid fitness level. Please choose beginner, intermediate, or advanced.")
     
     if days_per_week < 1 or days_per_week > 7:
-        return "Invalid number of days. Please choose between 1 and 7."
+        return _invalid_input("Invalid number of days. Please choose between 1 and 7.")
     
-    if equipment not in ["full gym", "basic dumbbells", "no equipment"]:
-        return "Invalid equipment option. Please choose full gym, basic dumbbells, or no equipment."
-
-    workout_plan = f"Workout Plan ({fitness_level} level, {goal} focus, {days_per_week} days/week, "
-    workout_plan += f"{'body weight only' if body_weight_only else equipment}):\n\n"
-
-    if body_weight_only:
-        if fitness_level == "beginner":
-            exercise_pool = body_weight_exercises["beginner"]
-        elif fitness_level == "intermediate":
-            exercise_pool = body_weight_exercises["beginner"] + body_weight_exercises["intermediate"]
-        else:  # advanced
-            exercise_pool = body_weight_exercises["beginner"] + body_weight_exercises["intermediate"] + body_weight_exercises["advanced"]
-    else:
-        if fitness_level == "beginner":
-            exercise_pool = exercises["beginner"][equipment]
-        elif fitness_level == "intermediate":
-            exercise_pool = exercises["beginner"][equipment] + exercises["intermediate"][equipment]
-        else:  # advanced
-            exercise_pool = exercises["beginner"][equipment] + exercises["intermediate"][equipment] + exercises["advanced"][equipment]
+    if equipment not in _EQUIPMENT_OPTIONS:
+        return _invalid_input("Invalid equipment option. Please choose full gym, basic dumbbells, or no equipment.")
+
+    exercise_pool = _POOLS[(fitness_level, equipment, bool(body_weight_only))]
+
+    goal_lower = goal.lower()
+    reps = "10-15 reps" if "weight" in goal_lower or "muscle" in goal_lower else "30-60 seconds"
 
+    exercises_per_day = min(5, len(exercise_pool))
+
+    days = []
     for day in range(1, days_per_week + 1):
-        workout_plan += f"Day {day}:\n"
-        daily_exercises = random.sample(exercise_pool, min(5, len(exercise_pool)))
-        for exercise in daily_exercises:
-            reps = "10-15 reps" if "weight" in goal.lower() or "muscle" in goal.lower() else "30-60 seconds"
-            workout_plan += f"- {exercise}: 3 sets of {reps}\n"
-        workout_plan += "- Cool-down: 5-10 minutes of light stretching\n\n"
-    
-    if duration:
-        workout_plan += f"Aim to complete each workout session in about {duration} minutes.\n"
-    
-    return workout_plan
+        daily_exercises = rng.sample(exercise_pool, exercises_per_day)
+        days.append(DaySpec(
+            day=day,
+            exercises=[ExerciseSpec(name=exercise, sets=3, reps=reps) for exercise in daily_exercises]
+        ))
+
+    workout_plan = WorkoutPlan(
+        intro=f"Workout Plan ({fitness_level} level, {goal} focus, {days_per_week} days/week, "
+              f"{'body weight only' if body_weight_only else equipment})",
+        days=days,
+        duration=duration or None,
+        cooldown="5-10 minutes of light stretching"
+    )
+
+    return workout_plan.json(exclude_none=True)
+
+def create_workout_plans(users: List[WorkoutPlannerInput], seed: Optional[int] = None) -> List[str]:
+    # Each user's plan gets its own seed drawn from the batch seed, so the whole batch is reproducible
+    seeds = random.Random(seed) if seed is not None else None
+    return [
+        create_workout_plan(**user.dict(), seed=seeds.getrandbits(64) if seeds else None)
+        for user in users
+    ]
 
 WorkoutPlannerTool = StructuredTool.from_function(
     func=create_workout_plan,
     name="WorkoutPlanner",
-    description="Creates a personalized workout plan based on fitness level, goals, schedule, available equipment, and preference for body weight exercises.",
+    description="Creates a personalized workout plan based on fitness level, goals, schedule, available equipment, and preference for body weight exercises. Returns the plan as JSON, or a JSON object with an \"error\" message if the input is invalid.",
     args_schema=WorkoutPlannerInput
 )
\ No newline at end of file